@@ -0,0 +1,135 @@
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional, fall back to numpy / plain Python loops
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+# Explicit signatures compile the kernels eagerly at import (or load them
+# from the on-disk cache), so the first request doesn't pay for the JIT
+@njit("Tuple((float64[:], float64[:], int8[:]))(float64[:], int64, int64)", cache=True)
+def ma_signals(close, w1, w2):
+    """Moving averages and signals in a single pass over close
+
+    Signal is 1 while MA1 is above MA2 and -1 otherwise, starting at index w1
+    (0 before). Like pandas rolling means, an MA is NaN while its window holds a NaN/inf close and recovers
+    once that value leaves the window.
+    """
+    n = close.shape[0]
+    ma1 = np.full(n, np.nan)
+    ma2 = np.full(n, np.nan)
+    sig = np.zeros(n, dtype=np.int8)
+    s1 = 0.0
+    s2 = 0.0
+    # Non-finite closes currently inside each window, kept out of the sums
+    bad1 = 0
+    bad2 = 0
+    for i in range(n):
+        c = close[i]
+        if np.isfinite(c):
+            s1 += c
+            s2 += c
+        else:
+            bad1 += 1
+            bad2 += 1
+        if i >= w1:
+            old = close[i - w1]
+            if np.isfinite(old):
+                s1 -= old
+            else:
+                bad1 -= 1
+        if i >= w2:
+            old = close[i - w2]
+            if np.isfinite(old):
+                s2 -= old
+            else:
+                bad2 -= 1
+        if i >= w1 - 1 and bad1 == 0:
+            ma1[i] = s1 / w1
+        if i >= w2 - 1 and bad2 == 0:
+            ma2[i] = s2 / w2
+        # NaN compares False, so bars before MA2 is defined count as -1
+        if i >= w1:
+            sig[i] = 1 if ma1[i] > ma2[i] else -1
+    return ma1, ma2, sig
+
+
+def _sma_numpy(close, w):
+    """Simple moving average over sliding window views, NaN before the first full window"""
+    out = np.full(close.shape[0], np.nan)
+    if close.shape[0] >= w:
+        out[w - 1:] = sliding_window_view(close, w).mean(axis=-1)
+    return out
+
+
+def _ma_signals_numpy(close, w1, w2):
+    """Vectorized equivalent of ma_signals"""
+    close = close.astype(np.float64)
+    # Treat inf like NaN, matching the kernel
+    close[~np.isfinite(close)] = np.nan
+    ma1 = _sma_numpy(close, w1)
+    ma2 = _sma_numpy(close, w2)
+    sig = np.zeros(close.shape[0], dtype=np.int8)
+    sig[w1:] = np.where(ma1[w1:] > ma2[w1:], 1, -1)
+    return ma1, ma2, sig
+
+
+if not HAVE_NUMBA:
+    # A per-element Python loop would be far slower than the numpy version
+    ma_signals = _ma_signals_numpy
+
+
+@njit("Tuple((int64, float64, float64, float64, float64, float64, int64))(float64[:], int8[:])", cache=True)
+def perf_stats(close, signal):
+    """Strategy statistics in a single pass over close and signal
+
+    Daily strategy returns are the close-to-close return scaled by the
+    previous bar's signal. Bars with a NaN/inf close are skipped and
+    the next return is taken from the last valid close. Returns (count,
+    total_return, buy_hold_return, mean, std, max_drawdown, wins); std is NaN
+    for fewer than two returns.
+    """
+    n = close.shape[0]
+    m = 0
+    mean = 0.0
+    m2 = 0.0
+    cum = 1.0
+    buy_hold = 1.0
+    running_max = -np.inf
+    max_drawdown = 0.0
+    wins = 0
+    prev = close[0] if n > 0 else np.nan
+    for i in range(1, n):
+        c = close[i]
+        if not np.isfinite(c):
+            continue
+        if not np.isfinite(prev):
+            prev = c
+            continue
+        r = c / prev - 1.0
+        prev = c
+        sr = r * signal[i - 1]
+        buy_hold *= 1.0 + r
+        cum *= 1.0 + sr
+        if cum > running_max:
+            running_max = cum
+        drawdown = (cum - running_max) / running_max
+        if drawdown < max_drawdown:
+            max_drawdown = drawdown
+        if sr > 0:
+            wins += 1
+        # Welford's update for mean and variance
+        m += 1
+        delta = sr - mean
+        mean += delta / m
+        m2 += delta * (sr - mean)
+    std = np.sqrt(m2 / (m - 1)) if m > 1 else np.nan
+    return m, cum - 1.0, buy_hold - 1.0, mean, std, max_drawdown, wins
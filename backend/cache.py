@@ -0,0 +1,133 @@
+import logging
+import os
+import tempfile
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Optional
+from urllib.parse import quote
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.getenv("CACHE_DIR", ".cache")
+CACHE_TTL = int(os.getenv("CACHE_TTL", 24 * 60 * 60))  # seconds
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1000))
+
+
+class FileCache:
+    """Parquet-backed DataFrame cache with a TTL and an in-memory LRU tier"""
+
+    def __init__(self, directory: str = CACHE_DIR, ttl: int = CACHE_TTL,
+                 max_entries: int = CACHE_MAX_ENTRIES, memory_size: int = 64):
+        self.directory = directory
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        # Keyed by (key, path, timestamp) so a rewritten entry is never served stale
+        self._load = lru_cache(maxsize=memory_size)(self._read)
+
+    @staticmethod
+    def _read(key: str, path: str, stamp: float) -> pd.DataFrame:
+        return pd.read_parquet(path)
+
+    def _paths(self, symbol: str, start_date: date, end_date: date) -> tuple:
+        # Symbols come straight from the request: percent-encode them so distinct
+        # symbols never share a directory, and escape dots so ".." stays inside
+        safe_symbol = quote(symbol, safe="").replace(".", "%2E")
+        base = os.path.join(self.directory, safe_symbol, f"{start_date}_{end_date}")
+        return f"{base}.parquet", f"{base}.ts"
+
+    @staticmethod
+    def _remove(*paths: str) -> None:
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def _sweep(self) -> None:
+        """Delete expired files and keep at most max_entries entries, oldest first"""
+        now = time.time()
+        entries = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                path = os.path.join(root, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                # Also catches orphaned sidecars and temp files of crashed writers
+                if now - mtime > self.ttl:
+                    self._remove(path)
+                elif name.endswith(".parquet"):
+                    entries.append((mtime, path))
+
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            self._remove(path[:-len(".parquet")] + ".ts", path)
+
+    def _miss(self, key: str) -> None:
+        self.misses += 1
+        logger.info("Cache miss for %s (hits=%d, misses=%d)", key, self.hits, self.misses)
+
+    def get(self, symbol: str, start_date: date, end_date: date) -> Optional[pd.DataFrame]:
+        """Return a copy of the cached frame, or None if missing or expired"""
+        key = f"{symbol}:{start_date}:{end_date}"
+        path, stamp_path = self._paths(symbol, start_date, end_date)
+
+        try:
+            with open(stamp_path) as f:
+                stamp = float(f.read())
+        except (OSError, ValueError):
+            self._miss(key)
+            return None
+
+        if time.time() - stamp > self.ttl:
+            # Sidecar first, so a concurrent reader sees a miss rather than a broken entry
+            self._remove(stamp_path, path)
+            self._miss(key)
+            return None
+
+        try:
+            data = self._load(key, path, stamp)
+        except Exception as e:
+            logger.warning("Failed to read cache entry %s: %s", key, e)
+            self._miss(key)
+            return None
+
+        self.hits += 1
+        logger.info("Cache hit for %s (hits=%d, misses=%d)", key, self.hits, self.misses)
+        # Callers own the frame they get back, never hand out the LRU's instance
+        return data.copy()
+
+    @staticmethod
+    def _write_atomic(path: str, write) -> None:
+        # Write to a unique temp file then rename, so concurrent writers (threads
+        # or workers) never share a temp path and readers never see a partial file
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def set(self, symbol: str, start_date: date, end_date: date, data: pd.DataFrame) -> None:
+        """Store a frame; failures are logged and never propagate to the caller"""
+        path, stamp_path = self._paths(symbol, start_date, end_date)
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._write_atomic(path, data.to_parquet)
+            self._write_atomic(stamp_path, lambda f: f.write(str(time.time()).encode()))
+            # Keys include user-chosen dates, so bound the directory on every write
+            self._sweep()
+        except Exception as e:
+            logger.warning("Failed to write cache entry %s:%s:%s: %s", symbol, start_date, end_date, e)
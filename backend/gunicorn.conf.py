@@ -0,0 +1,13 @@
+import os
+
+# Production server config, picked up automatically when running
+# `gunicorn main:app` from the backend directory
+bind = f"0.0.0.0:{os.getenv('PORT', '8000')}"
+# Conservative default: cpu_count() reports host CPUs inside containers, and
+# every worker holds its own in-memory caches. Scale up with WEB_CONCURRENCY.
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+worker_class = "uvicorn.workers.UvicornWorker"
+
+# Keep worker heartbeat files in memory when available
+if os.path.isdir("/dev/shm"):
+    worker_tmp_dir = "/dev/shm"
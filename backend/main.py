@@ -1,42 +1,92 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from pydantic import BaseModel
-from datetime import datetime
+from datetime import date, datetime
+from functools import lru_cache
+import asyncio
 import os
-from strategy import TradingStrategy
+import re
+import time
+from strategy import TradingStrategy, normalize_symbol
 
-app = FastAPI(title="Trading Strategy Simulator", version="1.0.0")
+app = FastAPI(
+    title="Trading Strategy Simulator",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Check if we're in production (Render) or development
 IS_PRODUCTION = os.getenv("RENDER") is not None
+ENVIRONMENT = "production" if IS_PRODUCTION else "development"
 
-# CORS middleware
-if IS_PRODUCTION:
-    # Production CORS - allow your Vercel frontend
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=[
-            "https://tradewhizz.vercel.app",  # Your actual Vercel URL
-        ],
-        allow_credentials=True,
-        allow_methods=["GET", "POST", "OPTIONS"],
-        allow_headers=["*"],
-    )
-else:
-    # Development CORS - allow localhost
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=["*"],  # Allow all origins in development
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
-    )
+# CORS middleware - production allows the Vercel frontend, development allows all origins
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["https://tradewhizz.vercel.app"] if IS_PRODUCTION else ["*"],
+    allow_credentials=True,
+    allow_methods=["GET", "POST", "OPTIONS"] if IS_PRODUCTION else ["*"],
+    allow_headers=["*"],
+)
+
+# Compress responses, chart data is long arrays of highly repetitive numbers
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
+# Content-hashed asset names, e.g. app.3f2a9c1d.js
+HASHED_ASSET = re.compile(r"\.[0-9a-f]{8,}\.[^./]+$")
+
+class CachedStaticFiles(StaticFiles):
+    """Static files with Cache-Control headers
+
+    Files are revalidated on every load (ETag/Last-Modified make that cheap)
+    so local edits show up; only content-hashed assets are cached as immutable.
+    """
 
-# Mount static files only in development
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if HASHED_ASSET.search(os.path.basename(full_path)):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+# Mount static files only in development, production serves the frontend from Vercel's CDN
 if not IS_PRODUCTION and os.path.exists("frontend"):
-    app.mount("/frontend", StaticFiles(directory="frontend"), name="frontend")
+    app.mount("/frontend", CachedStaticFiles(directory="frontend"), name="frontend")
+
+# Identical requests within the same TTL window are served from memory.
+# Each entry holds a full response (~1 MB for long histories) per worker.
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", 60 * 60))  # seconds
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", 32))
+
+if RESULT_CACHE_TTL <= 0:
+    raise ValueError("RESULT_CACHE_TTL must be a positive number of seconds")
+
+@lru_cache(maxsize=RESULT_CACHE_SIZE)
+def run_cached_simulation(symbol: str, start_date: date, end_date: date,
+                          ma1_window: int, ma2_window: int, ttl_bucket: int) -> dict:
+    # ttl_bucket only takes part in the cache key so entries expire
+    strategy = TradingStrategy(
+        symbol=symbol,
+        start_date=start_date,
+        end_date=end_date,
+        ma1_window=ma1_window,
+        ma2_window=ma2_window
+    )
+    return strategy.run_simulation()
+
+_result_cache_bucket = None
+
+def result_cache_bucket() -> int:
+    """Current TTL window; entries from earlier windows are dropped at once"""
+    global _result_cache_bucket
+    bucket = int(time.time() // RESULT_CACHE_TTL)
+    if bucket != _result_cache_bucket:
+        run_cached_simulation.cache_clear()
+        _result_cache_bucket = bucket
+    return bucket
 
 class SimulationRequest(BaseModel):
     symbol: str
@@ -50,32 +100,22 @@ class SimulationResponse(BaseModel):
     data: dict = None
     error: str = None
 
+API_INFO = {
+    "message": "Trading Strategy Simulator API" + ("" if IS_PRODUCTION else " - Development Mode"),
+    "version": app.version,
+    "status": "active",
+    "endpoints": {
+        "simulate": "/simulate",
+        "health": "/health"
+    }
+}
+
 @app.get("/")
 async def root():
-    if IS_PRODUCTION:
-        return {
-            "message": "Trading Strategy Simulator API",
-            "version": "1.0.0",
-            "status": "active",
-            "endpoints": {
-                "simulate": "/simulate",
-                "health": "/health"
-            }
-        }
-    else:
-        # In development, serve the frontend if it exists
-        if os.path.exists("frontend/index.html"):
-            return FileResponse("frontend/index.html")
-        else:
-            return {
-                "message": "Trading Strategy Simulator API - Development Mode",
-                "version": "1.0.0",
-                "status": "active",
-                "endpoints": {
-                    "simulate": "/simulate",
-                    "health": "/health"
-                }
-            }
+    # In development, serve the frontend if it exists
+    if not IS_PRODUCTION and os.path.exists("frontend/index.html"):
+        return FileResponse("frontend/index.html")
+    return API_INFO
 
 @app.get("/result")
 async def result_page():
@@ -94,25 +134,24 @@ async def simulate_strategy(request: SimulationRequest):
         if request.ma1_window >= request.ma2_window:
             raise ValueError("MA1 window should be smaller than MA2 window")
         
-        # Parse dates
-        start_date = datetime.strptime(request.start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(request.end_date, "%Y-%m-%d")
+        # Parse dates once, the date objects are passed through to yfinance
+        start_date = date.fromisoformat(request.start_date)
+        end_date = date.fromisoformat(request.end_date)
         
         if start_date >= end_date:
             raise ValueError("Start date must be before end date")
         
-        # Initialize strategy
-        strategy = TradingStrategy(
-            symbol=request.symbol,
-            start_date=request.start_date,
-            end_date=request.end_date,
-            ma1_window=request.ma1_window,
-            ma2_window=request.ma2_window
+        # Run simulation off the event loop (blocking network I/O and CPU work)
+        results = await asyncio.to_thread(
+            run_cached_simulation,
+            normalize_symbol(request.symbol),
+            start_date,
+            end_date,
+            request.ma1_window,
+            request.ma2_window,
+            result_cache_bucket()
         )
         
-        # Run simulation
-        results = strategy.run_simulation()
-        
         return SimulationResponse(success=True, data=results)
         
     except ValueError as e:
@@ -127,7 +166,7 @@ async def health_check():
         "message": "Trading Strategy Simulator API",
         "timestamp": datetime.now().isoformat(),
         "cors_enabled": True,
-        "environment": "production" if IS_PRODUCTION else "development"
+        "environment": ENVIRONMENT
     }
 
 # Add a test endpoint for CORS verification
@@ -136,9 +175,13 @@ async def test_connection():
     return {
         "message": "Backend connection successful!", 
         "cors_enabled": True,
-        "environment": "production" if IS_PRODUCTION else "development"
+        "environment": ENVIRONMENT
     }
 
 if __name__ == "__main__":
-    import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    if IS_PRODUCTION:
+        print("In production run the API with gunicorn: `gunicorn main:app` (see gunicorn.conf.py)")
+    else:
+        # Single-process server for local development
+        import uvicorn
+        uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
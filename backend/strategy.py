@@ -2,11 +2,51 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 from typing import Dict, List, Tuple
-from datetime import datetime
+from datetime import date
+from collections import OrderedDict
+import threading
+from cache import FileCache
+from _kernels import ma_signals, perf_stats
+
+_DATA_CACHE = FileCache()
+
+# Reuse Ticker objects so the session/crumb handshake happens once per symbol.
+# Bounded LRU, since each Ticker also keeps a copy of its last download.
+_TICKERS: "OrderedDict[str, yf.Ticker]" = OrderedDict()
+_TICKERS_MAX = 128
+_TICKERS_LOCK = threading.Lock()
+
+def normalize_symbol(symbol: str) -> str:
+    """Canonical form of a ticker symbol, shared by every cache key"""
+    return symbol.upper().strip()
+
+def _download_history(symbol: str, start_date: date, end_date: date) -> pd.DataFrame:
+    key = normalize_symbol(symbol)
+    # Check the ticker out of the pool so no two threads call history() on
+    # the same instance (it mutates internal state without locking)
+    with _TICKERS_LOCK:
+        ticker = _TICKERS.pop(key, None)
+    if ticker is None:
+        ticker = yf.Ticker(key)
+
+    data = ticker.history(start=start_date, end=end_date)
+
+    # Only symbols that actually returned data are worth keeping
+    if not data.empty:
+        with _TICKERS_LOCK:
+            _TICKERS[key] = ticker
+            while len(_TICKERS) > _TICKERS_MAX:
+                _TICKERS.popitem(last=False)
+    return data
+
+def _clean_values(values: np.ndarray) -> np.ndarray:
+    """Replace NaN/inf with 0 and round to 2 decimals"""
+    values = np.nan_to_num(values, nan=0.0, posinf=0.0, neginf=0.0)
+    return np.round(values, 2, out=values)
 
 class TradingStrategy:
-    def __init__(self, symbol: str, start_date: str, end_date: str, ma1_window: int, ma2_window: int):
-        self.symbol = symbol
+    def __init__(self, symbol: str, start_date: date, end_date: date, ma1_window: int, ma2_window: int):
+        self.symbol = normalize_symbol(symbol)
         self.start_date = start_date
         self.end_date = end_date
         self.ma1_window = ma1_window
@@ -17,77 +57,80 @@ class TradingStrategy:
     def fetch_data(self) -> pd.DataFrame:
         """Fetch historical stock data using yfinance"""
         try:
-            ticker = yf.Ticker(self.symbol)
-            data = ticker.history(start=self.start_date, end=self.end_date)
+            data = _DATA_CACHE.get(self.symbol, self.start_date, self.end_date)
+            if data is not None:
+                return data
+
+            data = _download_history(self.symbol, self.start_date, self.end_date)
             
             if data.empty:
                 raise ValueError(f"No data found for symbol {self.symbol}")
             
+            # Only Close and Volume are used downstream. Close stays float64:
+            # float32 spacing exceeds a cent above ~1e5, and prices, MAs and
+            # trades are all displayed to 2 decimals
+            data = data[['Close', 'Volume']]
+            
+            _DATA_CACHE.set(self.symbol, self.start_date, self.end_date, data)
             return data
         except Exception as e:
             raise ValueError(f"Failed to fetch data for {self.symbol}: {str(e)}")
     
     def calculate_moving_averages(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Calculate moving averages and generate signals"""
-        df = data.copy()
-        
-        # Calculate moving averages
-        df[f'MA{self.ma1_window}'] = df['Close'].rolling(window=self.ma1_window).mean()
-        df[f'MA{self.ma2_window}'] = df['Close'].rolling(window=self.ma2_window).mean()
-        
-        # Generate signals (1 for buy, -1 for sell, 0 for hold)
-        df['Signal'] = 0
-        mask = df.index[self.ma1_window:]
-        df.loc[mask, 'Signal'] = np.where(
-    df.loc[mask, f'MA{self.ma1_window}'] > df.loc[mask, f'MA{self.ma2_window}'], 1, -1
-)
-
-
-        
-        # Find crossover points
-        df['Position'] = df['Signal'].diff()
-        
-        return df
+        """Calculate moving averages and generate signals (in place)"""
+        # Moving averages and signals (1 for buy, -1 for sell, 0 for hold)
+        # in one pass over the close prices
+        close = data['Close'].to_numpy(dtype=np.float64)
+        ma1, ma2, signal = ma_signals(close, self.ma1_window, self.ma2_window)
+        data[f'MA{self.ma1_window}'] = ma1
+        data[f'MA{self.ma2_window}'] = ma2
+        data['Signal'] = signal
+        
+        return data
     
-    def identify_trades(self, data: pd.DataFrame) -> List[Dict]:
+    def find_crossovers(self, data: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+        """Find row indices where the signal flips (buys, sells)"""
+        signal = data['Signal'].to_numpy()
+        previous, current = signal[:-1], signal[1:]
+        buy_idx = np.flatnonzero((current == 1) & (previous == -1)) + 1
+        sell_idx = np.flatnonzero((current == -1) & (previous == 1)) + 1
+        return buy_idx, sell_idx
+    
+    def prepare_series(self, data: pd.DataFrame) -> Dict[str, np.ndarray]:
+        """Format dates and sanitize/round values once for trades and chart data"""
+        return {
+            # Day-precision datetime64 formats as YYYY-MM-DD in C, far faster than strftime
+            'dates': data.index.tz_localize(None).to_numpy().astype('datetime64[D]').astype('U10'),
+            'prices': _clean_values(data['Close'].to_numpy(dtype=np.float64)),
+            'ma1': _clean_values(data[f'MA{self.ma1_window}'].to_numpy()),
+            'ma2': _clean_values(data[f'MA{self.ma2_window}'].to_numpy()),
+            'volume': _clean_values(data['Volume'].to_numpy(dtype=np.float64))
+        }
+    
+    def identify_trades(self, series: Dict[str, np.ndarray], buy_idx: np.ndarray, sell_idx: np.ndarray) -> List[Dict]:
         """Identify buy and sell points"""
         trades = []
-        buy_signals = data[data['Position'] == 2]  # Buy signals (1 - (-1) = 2)
-        sell_signals = data[data['Position'] == -2]  # Sell signals (-1 - 1 = -2)
-        
-        # Buy signals
-        for idx, row in buy_signals.iterrows():
-            trades.append({
-                'date': idx.strftime('%Y-%m-%d'),
-                'price': round(row['Close'], 2),
-                'type': 'buy',
-                'ma1': round(row[f'MA{self.ma1_window}'], 2),
-                'ma2': round(row[f'MA{self.ma2_window}'], 2)
-            })
-        
-        # Sell signals
-        for idx, row in sell_signals.iterrows():
-            trades.append({
-                'date': idx.strftime('%Y-%m-%d'),
-                'price': round(row['Close'], 2),
-                'type': 'sell',
-                'ma1': round(row[f'MA{self.ma1_window}'], 2),
-                'ma2': round(row[f'MA{self.ma2_window}'], 2)
-            })
+        
+        for idx, trade_type in ((buy_idx, 'buy'), (sell_idx, 'sell')):
+            dates = series['dates'][idx].tolist()
+            prices = series['prices'][idx].tolist()
+            ma1_values = series['ma1'][idx].tolist()
+            ma2_values = series['ma2'][idx].tolist()
+            trades.extend(
+                {'date': d, 'price': p, 'type': trade_type, 'ma1': a, 'ma2': b}
+                for d, p, a, b in zip(dates, prices, ma1_values, ma2_values)
+            )
         
         return sorted(trades, key=lambda x: x['date'])
     
-    def calculate_metrics(self, data: pd.DataFrame) -> Dict:
+    def calculate_metrics(self, data: pd.DataFrame, buy_idx: np.ndarray, sell_idx: np.ndarray) -> Dict:
         """Calculate trading performance metrics"""
-        # Calculate returns
-        data['Returns'] = data['Close'].pct_change()
-        data['Strategy_Returns'] = data['Returns'] * data['Signal'].shift(1)
-        
-        # Remove NaN values
-        strategy_returns = data['Strategy_Returns'].dropna()
-        buy_and_hold_returns = data['Returns'].dropna()
+        count, total_return, buy_hold_return, mean, std, max_drawdown, wins = perf_stats(
+            data['Close'].to_numpy(dtype=np.float64),
+            data['Signal'].to_numpy()
+        )
         
-        if len(strategy_returns) == 0:
+        if count == 0:
             return {
                 'total_return': 0.0,
                 'sharpe_ratio': 0.0,
@@ -96,28 +139,17 @@ class TradingStrategy:
                 'total_trades': 0
             }
         
-        # Total return
-        total_return = (1 + strategy_returns).prod() - 1
-        buy_hold_return = (1 + buy_and_hold_returns).prod() - 1
-        
         # Sharpe ratio (assuming 252 trading days per year)
-        if strategy_returns.std() != 0:
-            sharpe_ratio = (strategy_returns.mean() / strategy_returns.std()) * np.sqrt(252)
+        if std != 0:
+            sharpe_ratio = (mean / std) * np.sqrt(252)
         else:
             sharpe_ratio = 0.0
         
-        # Maximum drawdown
-        cumulative_returns = (1 + strategy_returns).cumprod()
-        running_max = cumulative_returns.expanding().max()
-        drawdown = (cumulative_returns - running_max) / running_max
-        max_drawdown = drawdown.min()
-        
         # Win rate
-        positive_returns = strategy_returns[strategy_returns > 0]
-        win_rate = len(positive_returns) / len(strategy_returns) if len(strategy_returns) > 0 else 0
+        win_rate = wins / count
         
         # Count trades
-        total_trades = len(data[data['Position'].abs() == 2])
+        total_trades = buy_idx.size + sell_idx.size
         
         return {
             'total_return': round(total_return * 100, 2),
@@ -129,20 +161,9 @@ class TradingStrategy:
         }
 
 
-    def prepare_chart_data(self, data: pd.DataFrame) -> Dict:
-        """Prepare data for Plotly chart (sanitize NaNs)"""
-        df = data.copy()
-
-        # Fill NaNs and Infs
-        df = df.replace([np.inf, -np.inf], np.nan).fillna(0)
-
-        chart_data = {
-            'dates': [d.strftime('%Y-%m-%d') for d in df.index],
-            'prices': df['Close'].round(2).tolist(),
-            'ma1': df[f'MA{self.ma1_window}'].round(2).tolist(),
-            'ma2': df[f'MA{self.ma2_window}'].round(2).tolist(),
-            'volume': df['Volume'].astype(float).round(2).tolist()
-        }
+    def prepare_chart_data(self, series: Dict[str, np.ndarray]) -> Dict:
+        """Prepare data for Plotly chart"""
+        chart_data = {key: values.tolist() for key, values in series.items()}
 
         return chart_data
 
@@ -155,11 +176,17 @@ class TradingStrategy:
         # Calculate moving averages and signals
         self.data = self.calculate_moving_averages(self.data)
         
+        # Find crossover points
+        buy_idx, sell_idx = self.find_crossovers(self.data)
+        
+        # Format dates and round values once for trades and chart data
+        series = self.prepare_series(self.data)
+        
         # Identify trades
-        trades = self.identify_trades(self.data)
+        trades = self.identify_trades(series, buy_idx, sell_idx)
         
         # Calculate metrics
-        raw_metrics = self.calculate_metrics(self.data)
+        raw_metrics = self.calculate_metrics(self.data, buy_idx, sell_idx)
 
         # Sanitize all metric values (ensure no NaN or inf)
         sanitized_metrics = {
@@ -169,7 +196,7 @@ class TradingStrategy:
         }
         
         # Prepare chart data
-        chart_data = self.prepare_chart_data(self.data)
+        chart_data = self.prepare_chart_data(series)
         
         return {
             'symbol': self.symbol,
@@ -0,0 +1,81 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from cache import FileCache
+
+START, END = date(2020, 1, 1), date(2021, 1, 1)
+
+
+def _frame(value, n=500):
+    index = pd.date_range("2020-01-01", periods=n, freq="B")
+    return pd.DataFrame({"Close": np.full(n, float(value)), "Volume": np.arange(n)}, index=index)
+
+
+def test_concurrent_set_same_key(tmp_path, caplog):
+    frames = [_frame(i) for i in range(4)]
+    for attempt in range(10):
+        cache = FileCache(directory=str(tmp_path / str(attempt)))
+        barrier = threading.Barrier(len(frames))
+
+        def write(frame):
+            barrier.wait()
+            cache.set("AAPL", START, END, frame)
+
+        with caplog.at_level(logging.WARNING, logger="cache"):
+            with ThreadPoolExecutor(len(frames)) as pool:
+                list(pool.map(write, frames))
+        assert not caplog.records
+
+        cached = cache.get("AAPL", START, END)
+        assert cached is not None
+        assert any(cached.equals(frame) for frame in frames)
+        leftovers = [name for _, _, names in os.walk(tmp_path) for name in names if name.endswith(".tmp")]
+        assert not leftovers
+
+
+def test_get_removes_expired_entry(tmp_path):
+    cache = FileCache(directory=str(tmp_path))
+    cache.set("AAPL", START, END, _frame(1))
+    path, stamp_path = cache._paths("AAPL", START, END)
+    assert cache.get("AAPL", START, END) is not None
+
+    cache.ttl = -1
+    assert cache.get("AAPL", START, END) is None
+    assert not os.path.exists(path)
+    assert not os.path.exists(stamp_path)
+
+
+def test_set_sweeps_expired_and_caps_entries(tmp_path):
+    cache = FileCache(directory=str(tmp_path), ttl=3600, max_entries=2)
+    symbols = ["AAA", "BBB", "CCC"]
+    for age, symbol in zip((7200, 300, 200), symbols):
+        cache.set(symbol, START, END, _frame(1))
+        for path in cache._paths(symbol, START, END):
+            old = os.path.getmtime(path) - age
+            os.utime(path, (old, old))
+
+    # AAA is past the TTL; of the rest, BBB is oldest and falls outside the cap
+    cache.set("DDD", START, END, _frame(1))
+    remaining = {symbol for symbol in symbols + ["DDD"]
+                 if os.path.exists(cache._paths(symbol, START, END)[0])}
+    assert remaining == {"CCC", "DDD"}
+    assert not os.path.exists(cache._paths("AAA", START, END)[1])
+    assert not os.path.exists(cache._paths("BBB", START, END)[1])
+
+
+def test_paths_are_injective_and_contained(tmp_path):
+    cache = FileCache(directory=str(tmp_path))
+    symbols = ["VOD.L", "VOD_L", "VOD%2EL", "..", ".", "a/b", "a%2Fb", "^GSPC", "BRK-B"]
+    paths = [cache._paths(symbol, START, END)[0] for symbol in symbols]
+    assert len(set(paths)) == len(symbols)
+
+    root = os.path.realpath(tmp_path)
+    for path in paths:
+        # Each symbol gets its own directory directly under the cache root
+        assert os.path.dirname(os.path.dirname(os.path.realpath(path))) == root
@@ -0,0 +1,41 @@
+import numpy as np
+import pandas as pd
+
+from _kernels import _ma_signals_numpy, ma_signals, perf_stats
+
+
+def _close_with_gaps(n=3000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    close[[0, 500, 501, 1700]] = np.nan
+    close[2500] = np.inf
+    return close
+
+
+def test_ma_signals_matches_numpy_fallback_with_nan():
+    close = _close_with_gaps()
+    ma1, ma2, sig = ma_signals(close, 10, 100)
+    ma1_np, ma2_np, sig_np = _ma_signals_numpy(close, 10, 100)
+    np.testing.assert_allclose(ma1, ma1_np, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(ma2, ma2_np, rtol=1e-9, equal_nan=True)
+    np.testing.assert_array_equal(sig, sig_np)
+
+
+def test_ma_signals_recovers_like_pandas_rolling():
+    close = _close_with_gaps()
+    series = pd.Series(close.astype(np.float64)).replace(np.inf, np.nan)
+    ma1, ma2, _ = ma_signals(close, 10, 100)
+    np.testing.assert_allclose(ma1, series.rolling(10).mean(), rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(ma2, series.rolling(100).mean(), rtol=1e-9, equal_nan=True)
+
+
+def test_perf_stats_skips_nan_closes():
+    close = np.array([np.nan, 100, 110, np.nan, 121, 110], dtype=np.float64)
+    signal = np.array([0, 1, 1, 1, 1, 1], dtype=np.int8)
+    count, total_return, buy_hold_return, mean, std, max_drawdown, wins = perf_stats(close, signal)
+    assert count == 3
+    assert wins == 2
+    np.testing.assert_allclose(buy_hold_return, 0.1, rtol=1e-6)
+    np.testing.assert_allclose(total_return, 0.1, rtol=1e-6)
+    np.testing.assert_allclose(max_drawdown, 110 / 121 - 1, rtol=1e-6)
+    assert np.isfinite(mean) and np.isfinite(std)
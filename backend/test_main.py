@@ -0,0 +1,49 @@
+import os
+import subprocess
+import sys
+from datetime import date
+
+import main
+
+
+class _FakeStrategy:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+
+    def run_simulation(self):
+        return {"symbol": self.kwargs["symbol"]}
+
+
+def test_result_cache_bucket_clears_expired_entries(monkeypatch):
+    monkeypatch.setattr(main, "TradingStrategy", _FakeStrategy)
+    monkeypatch.setattr(main, "RESULT_CACHE_TTL", 60)
+    main.run_cached_simulation.cache_clear()
+
+    monkeypatch.setattr(main.time, "time", lambda: 1000.0)
+    bucket = main.result_cache_bucket()
+    main.run_cached_simulation("AAPL", date(2020, 1, 1), date(2021, 1, 1), 10, 50, bucket)
+    main.run_cached_simulation("AAPL", date(2020, 1, 1), date(2021, 1, 1), 10, 50, bucket)
+    assert main.run_cached_simulation.cache_info().hits == 1
+    assert main.run_cached_simulation.cache_info().currsize == 1
+
+    # Same window keeps the entry, the next window drops it
+    monkeypatch.setattr(main.time, "time", lambda: 1019.0)
+    assert main.result_cache_bucket() == bucket
+    assert main.run_cached_simulation.cache_info().currsize == 1
+
+    monkeypatch.setattr(main.time, "time", lambda: 1020.0)
+    assert main.result_cache_bucket() == bucket + 1
+    assert main.run_cached_simulation.cache_info().currsize == 0
+
+
+def test_non_positive_result_cache_ttl_is_rejected():
+    env = dict(os.environ, RESULT_CACHE_TTL="0")
+    result = subprocess.run(
+        [sys.executable, "-c", "import main"],
+        cwd=os.path.dirname(os.path.abspath(main.__file__)),
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "RESULT_CACHE_TTL must be a positive number of seconds" in result.stderr